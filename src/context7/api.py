@@ -1,9 +1,20 @@
 # src/context7/api.py
 import asyncio
 
-from fastapi import HTTPException, APIRouter
+from contextlib import asynccontextmanager, suppress
+from typing import Coroutine, Iterable
 
-from context7.core import search_libraries, format_search_results, fetch_library_docs
+import orjson
+
+from fastapi import FastAPI, HTTPException, APIRouter, Response
+
+from context7.core import (
+    search_libraries,
+    format_search_results,
+    fetch_library_docs,
+    get_client,
+    aclose_client,
+)
 from context7.exceptions import LibraryNotFoundException, DocumentationNotFoundException
 from context7.schemas import (
     GetDefaultPromptResponse,
@@ -24,25 +35,7 @@ from context7.logger import logger
 router = APIRouter()
 
 
-@router.post(
-    "/get_default_prompt",
-    response_model=GetDefaultPromptResponse,
-    description=(
-        "This endpoint provides the default instructional prompt used by the Context7 assistant. "
-        "It describes the overall query-resolution workflow, library matching strategies, "
-        "multi-library handling, and general guidelines the assistant should follow while answering "
-        "software related questions."
-    ),
-    operation_id="get_default_prompt",
-)
-async def get_default_prompt(
-    request: GetDefaultPromptRequest,
-) -> GetDefaultPromptResponse:
-    logger.success("Tool call: get_default_prompt()")
-    logger.debug(request.model_dump())
-
-    return GetDefaultPromptResponse(
-        default_prompt="""
+DEFAULT_PROMPT = """
 You are an assistant specialized in answering software development questions by using library documentation from Context7.
 
 Guidelines:
@@ -85,7 +78,99 @@ Guidelines:
    - If no matching docs are found for one or more libraries, state this clearly.
    - Ask the user to refine or restate the query if needed.
 """
+
+_DEFAULT_PROMPT_BYTES = orjson.dumps({"default_prompt": DEFAULT_PROMPT})
+
+
+async def _run_concurrently(coros: Iterable[Coroutine]) -> None:
+    """Run coroutines in a TaskGroup and re-raise the first failure unwrapped,
+    so AppExceptions still reach their exception handler."""
+    try:
+        async with asyncio.TaskGroup() as tg:
+            for coro in coros:
+                tg.create_task(coro)
+    except ExceptionGroup as eg:
+        raise eg.exceptions[0] from None
+
+
+async def warmup_cache() -> None:
+    """Prime the result cache for the libraries listed in settings.warmup_libraries.
+
+    Upstream calls are limited to settings.max_upstream_concurrency. Failures are
+    logged and swallowed; the lifespan runs this in the background so an
+    unreachable upstream never blocks startup.
+    """
+    if not settings.warmup_libraries:
+        return
+
+    semaphore = asyncio.Semaphore(settings.max_upstream_concurrency)
+    library_ids: list[str | None] = [None] * len(settings.warmup_libraries)
+    fetched: list[str] = []
+
+    async def _resolve(i: int, name: str):
+        try:
+            async with semaphore:
+                resp = await search_libraries(name)
+        except Exception as e:
+            logger.warning(f"Warmup: resolving '{name}' failed: {e}")
+            return
+        if resp.results:
+            library_ids[i] = resp.results[0].id
+
+    async def _fetch(library_id: str):
+        try:
+            async with semaphore:
+                docs = await fetch_library_docs(library_id, settings.default_tokens, "")
+        except Exception as e:
+            logger.warning(f"Warmup: fetching docs for '{library_id}' failed: {e}")
+            return
+        if docs is not None:
+            fetched.append(library_id)
+
+    await _run_concurrently(
+        _resolve(i, name) for i, name in enumerate(settings.warmup_libraries)
     )
+    resolved = [library_id for library_id in library_ids if library_id]
+    logger.info(f"Warmup: resolved {len(resolved)}/{len(library_ids)} libraries.")
+
+    if not settings.warmup_docs:
+        return
+
+    await _run_concurrently(_fetch(library_id) for library_id in resolved)
+    logger.info(f"Warmup: fetched documentation for {len(fetched)}/{len(resolved)} libraries.")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_client()
+    logger.info("Upstream HTTP client ready.")
+    warmup = asyncio.create_task(warmup_cache())
+    yield
+    warmup.cancel()
+    with suppress(asyncio.CancelledError):
+        await warmup
+    await aclose_client()
+    logger.info("Upstream HTTP client closed.")
+
+
+@router.post(
+    "/get_default_prompt",
+    response_model=GetDefaultPromptResponse,
+    description=(
+        "This endpoint provides the default instructional prompt used by the Context7 assistant. "
+        "It describes the overall query-resolution workflow, library matching strategies, "
+        "multi-library handling, and general guidelines the assistant should follow while answering "
+        "software related questions."
+    ),
+    operation_id="get_default_prompt",
+)
+async def get_default_prompt(
+    request: GetDefaultPromptRequest,
+) -> Response:
+    logger.success("Tool call: get_default_prompt()")
+    logger.opt(lazy=True).debug("{}", request.model_dump)
+
+    return Response(content=_DEFAULT_PROMPT_BYTES, media_type="application/json")
 
 
 @router.post(
@@ -102,14 +187,10 @@ async def resolve_library_id(
     request: ResolveLibraryIDRequest,
 ):
     logger.success("Tool call: resolve_library_id()")
-    logger.debug(request.model_dump())
+    logger.opt(lazy=True).debug("{}", request.model_dump)
 
-    resp = await search_libraries(
-        request.library_name,
-        client_ip=None,
-        api_key=settings.api_key.get_secret_value(),
-    )
-    if not resp.get("results"):
+    resp = await search_libraries(request.library_name)
+    if not resp.results:
         raise LibraryNotFoundException()
     result = format_search_results(resp)
     return ResolveLibraryIDResponse(library_id=result)
@@ -130,15 +211,9 @@ async def get_library_docs(
     request: GetLibraryDocsRequest,
 ) -> GetLibraryDocsResponse:
     logger.success("Tool call: get_library_docs()")
-    logger.debug(request.model_dump())
-
-    docs = await fetch_library_docs(
-        request.library_id,
-        request.tokens,
-        request.topic,
-        client_ip=None,
-        api_key=settings.api_key.get_secret_value(),
-    )
+    logger.opt(lazy=True).debug("{}", request.model_dump)
+
+    docs = await fetch_library_docs(request.library_id, request.tokens, request.topic)
     if not docs:
         raise DocumentationNotFoundException()
     return GetLibraryDocsResponse(library_info=docs)
@@ -156,20 +231,26 @@ async def get_library_docs(
 )
 async def resolve_multiple_library_ids(
     request: ResolveMultipleLibraryIDsRequest,
-) -> ResolveMultipleLibraryIDsResponse:
+) -> Response:
     logger.success("Tool call: resolve_multiple_library_ids()")
-    logger.debug(request.model_dump())
+    logger.opt(lazy=True).debug("{}", request.model_dump)
 
-    async def _search(name: str):
-        resp = await search_libraries(
-            name, client_ip=None, api_key=settings.api_key.get_secret_value()
-        )
-        if not resp.get("results"):
+    results: list[str | None] = [None] * len(request.library_names)
+    semaphore = asyncio.Semaphore(settings.max_upstream_concurrency)
+
+    async def _search(i: int, name: str):
+        async with semaphore:
+            resp = await search_libraries(name)
+        if not resp.results:
             raise LibraryNotFoundException(message=f"No matching library ids found for names {request.library_names}")
-        return format_search_results(resp)
+        results[i] = format_search_results(resp)
 
-    results = await asyncio.gather(*[_search(name) for name in request.library_names])
-    return ResolveMultipleLibraryIDsResponse(library_ids=results)
+    await _run_concurrently(
+        _search(i, name) for i, name in enumerate(request.library_names)
+    )
+    return Response(
+        content=orjson.dumps({"library_ids": results}), media_type="application/json"
+    )
 
 
 @router.post(
@@ -184,9 +265,9 @@ async def resolve_multiple_library_ids(
 )
 async def get_multiple_library_docs(
     request: GetMultipleLibraryDocsRequest,
-) -> GetMultipleLibraryDocsResponse:
+) -> Response:
     logger.success("Tool call: get_multiple_library_docs()")
-    logger.debug(request.model_dump())
+    logger.opt(lazy=True).debug("{}", request.model_dump)
 
     if not (len(request.library_ids) == len(request.tokens) == len(request.topics)):
         raise HTTPException(
@@ -194,20 +275,24 @@ async def get_multiple_library_docs(
             detail="Lengths of library_ids, tokens, and topics must match.",
         )
 
-    async def _fetch(lib_id: str, t: int, top: str):
-        docs = await fetch_library_docs(
-            lib_id, t, top, client_ip=None, api_key=settings.api_key.get_secret_value()
-        )
-        return (
+    results: list[str | None] = [None] * len(request.library_ids)
+    semaphore = asyncio.Semaphore(settings.max_upstream_concurrency)
+
+    async def _fetch(i: int, lib_id: str, t: int, top: str):
+        async with semaphore:
+            docs = await fetch_library_docs(lib_id, t, top)
+        results[i] = (
             docs
             if docs
             else f"Documentation not found for {lib_id} with topic '{top}'."
         )
 
-    results = await asyncio.gather(
-        *[
-            _fetch(request.library_ids[i], request.tokens[i], request.topics[i])
-            for i in range(len(request.library_ids))
-        ]
+    await _run_concurrently(
+        _fetch(i, lib_id, t, top)
+        for i, (lib_id, t, top) in enumerate(
+            zip(request.library_ids, request.tokens, request.topics)
+        )
+    )
+    return Response(
+        content=orjson.dumps({"library_infos": results}), media_type="application/json"
     )
-    return GetMultipleLibraryDocsResponse(library_infos=results)
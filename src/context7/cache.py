@@ -0,0 +1,87 @@
+# src/context7/cache.py
+"""
+Context7 Cache Utilities
+========================
+
+In-process caching for the asynchronous Context7 API helpers.
+
+Main features:
+- TTL + LRU eviction of cached results.
+- Coalescing of concurrent calls with identical arguments into a single upstream request.
+- Opt-out of caching for results that signal a transient failure.
+"""
+
+import asyncio
+import functools
+import inspect
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+
+def async_ttl_cache(
+    ttl: float, maxsize: int, cache_if: Callable[[Any], bool] = lambda result: True
+):
+    """Cache the results of a coroutine function for a limited time.
+
+    The in-flight task is stored rather than the finished value, so callers that
+    arrive while the first request is still pending await the same task instead
+    of issuing their own upstream call.
+
+    Args:
+        ttl (float): Number of seconds a result stays valid.
+        maxsize (int): Maximum number of cached entries before the least recently used is evicted.
+        cache_if (Callable[[Any], bool], optional): Predicate deciding whether a finished
+            result may stay in the cache. Failed calls are never cached.
+
+    Returns:
+        Callable: Decorator wrapping the coroutine function. The wrapper exposes
+        `cache_clear()` to drop all entries.
+    """
+
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        parameters = inspect.signature(func).parameters.values()
+        if any(p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD) for p in parameters):
+            raise TypeError("async_ttl_cache does not support *args or **kwargs")
+        names = tuple(p.name for p in parameters)
+        defaults = tuple(p.default for p in parameters)
+        entries: OrderedDict[tuple, tuple[float, asyncio.Future]] = OrderedDict()
+
+        def _make_key(args: tuple, kwargs: dict) -> tuple:
+            # Positional arguments first, then keywords or defaults for the
+            # remaining parameters, so f(1) and f(x=1) share an entry.
+            n = len(args)
+            if not kwargs:
+                return args + defaults[n:]
+            return args + tuple(
+                kwargs.get(name, default)
+                for name, default in zip(names[n:], defaults[n:])
+            )
+
+        def _discard_unless_cacheable(key: tuple, task: asyncio.Future) -> None:
+            if task.cancelled() or task.exception() is not None or not cache_if(task.result()):
+                entry = entries.get(key)
+                if entry is not None and entry[1] is task:
+                    del entries[key]
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs)
+            now = time.monotonic()
+            entry = entries.get(key)
+            if entry is not None and entry[0] > now:
+                entries.move_to_end(key)
+                return await asyncio.shield(entry[1])
+
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            entries[key] = (now + ttl, task)
+            entries.move_to_end(key)
+            while len(entries) > maxsize:
+                entries.popitem(last=False)
+            task.add_done_callback(functools.partial(_discard_unless_cacheable, key))
+            return await asyncio.shield(task)
+
+        wrapper.cache_clear = entries.clear
+        return wrapper
+
+    return decorator
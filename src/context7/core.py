@@ -8,18 +8,72 @@ This module provides essential support functions for interacting with the Contex
 Main features:
 - AES encryption of client IPs using a shared secret key.
 - Header generation with encrypted IP and Bearer API key injection.
-- Asynchronous HTTPX clients for searching libraries and retrieving documentation.
+- Prebuilt headers for the common case of the configured API key without a client IP.
+- A shared, connection-pooled HTTPX client (HTTP/2, keep-alive) for all upstream calls.
+- Asynchronous helpers for searching libraries and retrieving documentation.
+  Large documentation bodies are decoded in a worker thread to keep the event loop free.
+- TTL caching of search and documentation results with coalescing of concurrent calls.
 - Utility for formatting search results into human-readable summaries.
 """
 
+import asyncio
+import functools
 import secrets
 import httpx
+import msgspec
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives import padding
 from cryptography.hazmat.backends import default_backend
+from context7.cache import async_ttl_cache
+from context7.logger import logger
+from context7.schemas import SearchResponse, SearchResult
 from context7.settings import settings
 
 
+_client: httpx.AsyncClient | None = None
+
+_INLINE_DECODE_LIMIT = 64 * 1024
+_SEARCH_DECODER = msgspec.json.Decoder(SearchResponse)
+
+_AES_KEY = bytes.fromhex(settings.client_ip_encryption_key.get_secret_value())
+_BACKEND = default_backend()
+
+_API_KEY = settings.api_key.get_secret_value()
+_BASE_HEADERS_AUTH = {"Authorization": f"Bearer {_API_KEY}"}
+_DOCS_EXTRA_HEADERS = {"X-Context7-Source": "mcp-server"}
+_BASE_HEADERS_DOCS = {**_BASE_HEADERS_AUTH, **_DOCS_EXTRA_HEADERS}
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared HTTPX client, creating it on first use.
+
+    The client keeps connections to the Context7 API alive and multiplexes
+    requests over HTTP/2, so TCP and TLS handshakes are only paid once.
+
+    Returns:
+        httpx.AsyncClient: The process-wide client instance.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                max_connections=settings.http_max_connections,
+            ),
+            timeout=settings.http_timeout,
+        )
+    return _client
+
+
+async def aclose_client() -> None:
+    """Close the shared HTTPX client and release its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
 def encrypt_client_ip(ip: str) -> str:
     """Encrypt a client IP address with AES-CBC using the configured key.
 
@@ -30,10 +84,8 @@ def encrypt_client_ip(ip: str) -> str:
         str: A hex-formatted string consisting of `iv:ct` where `iv` is the
         initialization vector and `ct` is the cipher text.
     """
-    key_hex = settings.client_ip_encryption_key
-    key = bytes.fromhex(key_hex)
     iv = secrets.token_bytes(16)
-    cipher = Cipher(algorithms.AES(key), modes.CBC(iv), backend=default_backend())
+    cipher = Cipher(algorithms.AES(_AES_KEY), modes.CBC(iv), backend=_BACKEND)
     encryptor = cipher.encryptor()
     padder = padding.PKCS7(128).padder()
     padded = padder.update(ip.encode()) + padder.finalize()
@@ -62,29 +114,57 @@ def generate_headers(
     return headers
 
 
-async def search_libraries(
-    query: str, client_ip: str = None, api_key: str = None
+def _upstream_headers(
+    base: dict, client_ip: str = None, api_key: str = None, extra: dict = None
 ) -> dict:
+    """Select request headers, reusing prebuilt dicts for the configured API key.
+
+    Args:
+        base (dict): Prebuilt headers for the configured API key.
+        client_ip (str, optional): Client IP address to encrypt and include.
+        api_key (str, optional): Bearer token for authentication.
+        extra (dict, optional): Extra headers, only used when falling back to `generate_headers`.
+
+    Returns:
+        dict: `base` itself when no client IP is given, a copy with the encrypted
+        client IP otherwise, or freshly generated headers for any other API key.
+    """
+    if api_key == _API_KEY:
+        if not client_ip:
+            return base
+        return {**base, "mcp-client-ip": encrypt_client_ip(client_ip)}
+    return generate_headers(client_ip, api_key, extra)
+
+
+@async_ttl_cache(
+    ttl=settings.cache_ttl_seconds,
+    maxsize=settings.cache_max_size,
+    cache_if=lambda resp: resp.error is None,
+)
+async def search_libraries(
+    query: str, client_ip: str = None, api_key: str = _API_KEY
+) -> SearchResponse:
     """Search the Context7 API for libraries by query string.
 
     Args:
         query (str): Search term, e.g. 'FastAPI' or 'SQLAlchemy'.
         client_ip (str, optional): Client IP for header encryption.
-        api_key (str, optional): Authentication token.
+        api_key (str, optional): Authentication token. Defaults to settings.api_key.
 
     Returns:
-        dict: Context7 JSON response with 'results' and possible 'error' field.
+        SearchResponse: Parsed Context7 response with 'results' and possible 'error' field.
+        Successful responses are cached for settings.cache_ttl_seconds.
     """
     url = f"{settings.context7_api_base_url}/v1/search"
-    async with httpx.AsyncClient() as client:
-        r = await client.get(
-            url, params={"query": query}, headers=generate_headers(client_ip, api_key)
-        )
-    return (
-        r.json()
-        if r.status_code == 200
-        else {"error": f"{r.status_code}", "results": []}
-    )
+    headers = _upstream_headers(_BASE_HEADERS_AUTH, client_ip, api_key)
+    r = await get_client().get(url, params={"query": query}, headers=headers)
+    if r.status_code != 200:
+        return SearchResponse(error=f"{r.status_code}")
+    try:
+        return _SEARCH_DECODER.decode(r.content)
+    except msgspec.DecodeError as e:  # includes msgspec.ValidationError
+        logger.warning(f"Malformed search response for '{query}': {e}")
+        return SearchResponse(error=f"Malformed search response: {e}")
 
 
 async def fetch_library_docs(
@@ -92,7 +172,7 @@ async def fetch_library_docs(
     tokens: int = settings.default_tokens,
     topic: str = "",
     client_ip: str = None,
-    api_key: str = None,
+    api_key: str = _API_KEY,
 ) -> str | None:
     """Fetch documentation text for a given library ID.
 
@@ -101,59 +181,79 @@ async def fetch_library_docs(
         tokens (int, optional): Maximum token count for the returned content. Defaults to settings.default_tokens.
         topic (str, optional): Optional keyword filter to limit which sections are retrieved. Defaults to "".
         client_ip (str, optional): Client IP for header encryption.
-        api_key (str, optional): Authentication token.
+        api_key (str, optional): Authentication token. Defaults to settings.api_key.
 
     Returns:
         str | None: Raw documentation text string if available, otherwise None.
+        Found documentation is cached for settings.cache_ttl_seconds.
     """
-    if library_id.startswith("/"):
-        library_id = library_id[1:]
+    # Normalise before the cache lookup so requests that reach the same
+    # upstream URL share a cache entry.
+    return await _fetch_library_docs(
+        library_id.removeprefix("/"),
+        max(tokens, settings.minimum_tokens),
+        topic,
+        client_ip,
+        api_key,
+    )
+
+
+@async_ttl_cache(
+    ttl=settings.cache_ttl_seconds,
+    maxsize=settings.docs_cache_max_size,
+    cache_if=lambda text: text is not None,
+)
+async def _fetch_library_docs(
+    library_id: str, tokens: int, topic: str, client_ip: str, api_key: str
+) -> str | None:
+    """Cached upstream fetch behind `fetch_library_docs`; expects normalised arguments."""
     url = f"{settings.context7_api_base_url}/v1/{library_id}"
     params = {
-        "tokens": str(max(tokens, settings.minimum_tokens)),
+        "tokens": str(tokens),
         "topic": topic,
         "type": "txt",
     }
-    async with httpx.AsyncClient() as client:
-        r = await client.get(
-            url,
-            params=params,
-            headers=generate_headers(
-                client_ip, api_key, {"X-Context7-Source": "mcp-server"}
-            ),
-        )
-    if r.status_code == 200:
-        text = r.text
-        return (
-            None
-            if text in ("No content available", "No context data available")
-            else text
+    headers = _upstream_headers(
+        _BASE_HEADERS_DOCS, client_ip, api_key, _DOCS_EXTRA_HEADERS
+    )
+    async with get_client().stream("GET", url, params=params, headers=headers) as r:
+        if r.status_code != 200:
+            return None
+        content = await r.aread()
+        encoding = r.encoding or "utf-8"
+    if len(content) < _INLINE_DECODE_LIMIT:
+        text = content.decode(encoding, errors="replace")
+    else:
+        text = await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(content.decode, encoding, errors="replace")
         )
-    return None
+    return (
+        None
+        if text in ("No content available", "No context data available")
+        else text
+    )
+
+
+def _format_search_result(r: SearchResult) -> str:
+    """Format a single search result record as a multi-line summary."""
+    out = f"- Title: {r.title}\n- ID: {r.id}\n- Description: {r.description}"
+    if r.total_snippets and r.total_snippets > 0:
+        out += f"\n- Code Snippets: {r.total_snippets}"
+    if r.trust_score:
+        out += f"\n- Trust Score: {r.trust_score}"
+    if r.versions:
+        out += f"\n- Versions: {', '.join(r.versions)}"
+    return out
 
 
-def format_search_results(resp: dict) -> str:
+def format_search_results(resp: SearchResponse) -> str:
     """Convert Context7 search results into a human-readable summary.
 
     Args:
-        resp (dict): JSON response object from `search_libraries`.
+        resp (SearchResponse): Parsed response object from `search_libraries`.
 
     Returns:
         str: Human formatted multi-line string describing the top matches, including
         title, ID, description, snippet count, trust score, and versions if present.
     """
-    res = []
-    for r in resp.get("results", []):
-        out = [
-            f"- Title: {r.get('title', '')}",
-            f"- ID: {r.get('id', '')}",
-            f"- Description: {r.get('description', '')}",
-        ]
-        if r.get("totalSnippets", -1) > 0:
-            out.append(f"- Code Snippets: {r['totalSnippets']}")
-        if r.get("trustScore"):
-            out.append(f"- Trust Score: {r['trustScore']}")
-        if r.get("versions"):
-            out.append(f"- Versions: {', '.join(r['versions'])}")
-        res.append("\n".join(out))
-    return "\n----------\n".join(res)
+    return "\n----------\n".join(map(_format_search_result, resp.results))
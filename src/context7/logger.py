@@ -1,9 +1,7 @@
+import functools
 import logging
-import re
 import sys
 
-from http import HTTPStatus
-
 from loguru import logger
 from starlette.routing import Route, Mount
 
@@ -16,6 +14,13 @@ level_icons = {
     "CRITICAL": "💥",
 }
 
+_level_icon_markup = {
+    name: f"<blink>{icon}</blink>" if name in ["WARNING", "ERROR", "CRITICAL"] else icon
+    for name, icon in level_icons.items()
+}
+
+_MARKUP_ESCAPE_TABLE = str.maketrans({"<": "\\<", "{": "{{", "}": "}}"})
+
 
 class InterceptHandler(logging.Handler):
     def emit(self, record):
@@ -26,216 +31,48 @@ class InterceptHandler(logging.Handler):
         logger.opt(exception=record.exc_info, depth=6).log(level, record.getMessage())
 
 
-def escape_invalid_tags(msg):
-    known_tags = {
-        "red",
-        "green",
-        "blue",
-        "yellow",
-        "magenta",
-        "cyan",
-        "white",
-        "black",
-        "bold",
-        "blink",
-        "level",
-        "reset",
-    }
-
-    def replace_tag(m):
-        tag = m.group(1).lstrip("/")
-        if tag in known_tags:
-            return m.group(0)
-        else:
-            return m.group(0).replace("<", "&lt;").replace(">", "&gt;")
-
-    return re.sub(r"<(/?\w+)>", replace_tag, msg)
-
-
-def color_http(message_str):
-    HTTP_METHODS = ["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH", "HEAD"]
-
-    def code_color(code):
-        if 200 <= code < 300:
-            return "green"
-        elif 300 <= code < 400:
-            return "yellow"
-        elif 400 <= code < 600:
-            return "red"
-        else:
-            return "white"
-
-    for method in HTTP_METHODS:
-        pattern = rf"\b{method}\b"
-        replacement = f"<blue>{method}</blue>"
-        message_str = re.sub(pattern, replacement, message_str)
-
-    message_str = re.sub(
-        r"\bhttps?\b",
-        lambda m: f"<magenta>{m.group(0)}</magenta>",
-        message_str,
-        flags=re.IGNORECASE,
-    )
-
-    for status in HTTPStatus:
-        code = str(status.value)
-        color = code_color(status.value)
-        pattern = rf"\b{code}\b"
-        replacement = f"<{color}>{code}</{color}>"
-        message_str = re.sub(pattern, replacement, message_str)
-
-    return message_str
-
-
-def colorize_outside_tags(s):
-    result = []
-    i = 0
-
-    while i < len(s):
-        if s[i] == "<":
-            tag_end = s.find(">", i)
-            if tag_end != -1:
-                potential_tag = s[i : tag_end + 1]
-                if re.match(
-                    r"</?(?:red|green|blue|yellow|magenta|cyan|white|black|bold|blink|level)>",
-                    potential_tag,
-                ):
-                    result.append(potential_tag)
-                    i = tag_end + 1
-                    continue
-
-        c = s[i]
-        if c == ":":
-            result.append("<red>:</red>")
-        elif c == "/":
-            result.append("<yellow>/</yellow>")
-        elif c == ".":
-            result.append("<green>.</green>")
-        elif c == "{":
-            result.append("<red>{</red>")
-        elif c == "}":
-            result.append("<red>}</red>")
-        elif c == "[":
-            result.append("<cyan>[</cyan>")
-        elif c == "]":
-            result.append("<cyan>]</cyan>")
-        elif c == "'":
-            result.append("<green>'</green>")
-        elif c == "_":
-            result.append("<magenta>_</magenta>")
-        elif c == "-":
-            result.append("<magenta>-</magenta>")
-        elif c == ",":
-            result.append("<green>,</green>")
-        else:
-            result.append(c)
-        i += 1
-
-    return "".join(result)
-
-
-def validate_balanced_tags(s):
-    """Ensure all tags are properly balanced"""
-    stack = []
-
-    for match in re.finditer(r"<(/?)(\w+)>", s):
-        is_closing = bool(match.group(1))
-        tag_name = match.group(2)
-
-        if is_closing:
-            if not stack or stack[-1] != tag_name:
-                return re.sub(
-                    r"</?(?:red|green|blue|yellow|magenta|cyan|white|black|bold|blink|level)>",
-                    "",
-                    s,
-                )
-            stack.pop()
-        else:
-            stack.append(tag_name)
-
-    if stack:
-        return re.sub(
-            r"</?(?:red|green|blue|yellow|magenta|cyan|white|black|bold|blink|level)>",
-            "",
-            s,
-        )
-
-    return s
-
+@functools.lru_cache(maxsize=1024)
+def _format_location(file_path, line):
+    parts = file_path.split("contex7-python")
+    file_path = "." + parts[-1]
+    max_len = 25
+    loc_content = f"{file_path}:{line}"
 
-def escape_curly_outside_tags(s: str) -> str:
-    result = []
-    i = 0
-
-    while i < len(s):
-        if i < len(s) - 1 and s[i] == "<":
-            tag_end = s.find(">", i)
-            if tag_end != -1:
-                potential_tag = s[i : tag_end + 1]
-                if re.match(r"</?(\w+)>", potential_tag):
-                    result.append(potential_tag)
-                    i = tag_end + 1
-                    continue
+    if len(loc_content) > max_len:
+        pad_len = max_len - 3
+        loc_content = "..." + loc_content[-pad_len:]
+    else:
+        loc_content = loc_content.ljust(max_len)
+    loc_content = loc_content.translate(_MARKUP_ESCAPE_TABLE)
 
-        c = s[i]
-        if c == "{":
-            result.append("{{")
-        elif c == "}":
-            result.append("}}")
-        else:
-            result.append(c)
-        i += 1
+    for base_dir in ["src", "eval", "tests"]:
+        if base_dir in file_path:
+            loc_content = f"<bold>{loc_content}</bold>"
+            break
 
-    return "".join(result)
+    return f"<white>{loc_content}</white>"
 
 
 def formatter(record):
     try:
         time_str = f"<green>{record['time']:%y-%m-%d %H:%M:%S}</green>"
-        icon = level_icons.get(record["level"].name, "")
-        if record["level"].name in ["WARNING", "ERROR", "CRITICAL"]:
-            icon = f"<blink>{icon}</blink>"
-
-        file_path = record["file"].path
-        parts = file_path.split("contex7-python")
-        file_path = "." + parts[-1]
-        max_len = 25
-        line_str = str(record["line"])
-        loc_content = f"{file_path}:{line_str}"
-
-        if len(loc_content) > max_len:
-            pad_len = max_len - 3
-            loc_content = "..." + loc_content[-pad_len:]
-        else:
-            loc_content = loc_content.ljust(max_len)
-
-        for base_dir in ["src", "eval", "tests"]:
-            if base_dir in file_path:
-                loc_content = f"<bold>{loc_content}</bold>"
-                break
-
-        loc_str = f"<white>{loc_content}</white>"
-
-        message_str = str(record["message"])
-
-        message_str = colorize_outside_tags(message_str)
-        message_str = color_http(message_str)
-        message_str = escape_curly_outside_tags(message_str)
-        message_str = escape_invalid_tags(message_str)
-
-        message_str = validate_balanced_tags(message_str)
-
-        links = [time_str, icon, loc_str, message_str]
-        return "|".join(links) + "\n"
+        icon = _level_icon_markup.get(record["level"].name, "")
+        loc_str = _format_location(record["file"].path, record["line"])
+
+        # The message is substituted by loguru itself, so its content is never
+        # parsed as markup unless the caller logs with `opt(colors=True)`.
+        # Callable formats must opt in to tracebacks explicitly.
+        links = [time_str, icon, loc_str, "{message}"]
+        return "|".join(links) + "\n{exception}"
     except Exception as e:
         print(f"Formatter error: {e}")
-        return f"{record['time']:%y-%m-%d %H:%M:%S} | {record['level'].name} | {record['message']}\n"
+        return "{time:YY-MM-DD HH:mm:ss} | {level} | {message}\n{exception}"
 
 
 def print_settings(settings):
     if settings is not None:
         lines = str(settings).split("\n")
-        logger.info(f"<red>{lines[0]}</red>")
+        logger.opt(colors=True).info(f"<red>{lines[0]}</red>")
         for line in lines[1:]:
             logger.info(line)
     else:
@@ -281,7 +118,7 @@ def print_routes(app):
             + "path".ljust(path_header_offset)
             + "methods</red>"
         )
-        logger.info(header_methods)
+        logger.opt(colors=True).info(header_methods)
         for route in app.routes:
             _print_recursive(route)
     else:
@@ -303,7 +140,7 @@ def print_mcp_server(mcp_server):
             + "description"
             + "</red>"
         )
-        logger.info(header)
+        logger.opt(colors=True).info(header)
 
         for tool in mcp_server.tools:
             tool_name = (
@@ -354,6 +191,7 @@ def setup_logging(log_level="INFO", settings=None):
         colorize=True,
         format=formatter,
         level=log_level,
+        diagnose=False,
     )
     logging.basicConfig(handlers=[InterceptHandler()], level=0, force=True)
 
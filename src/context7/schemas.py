@@ -1,4 +1,6 @@
 from typing import List
+
+import msgspec
 from pydantic import BaseModel, Field
 
 from context7.settings import settings
@@ -69,7 +71,7 @@ class GetLibraryDocsResponse(BaseModel):
 
 
 class GetMultipleLibraryDocsRequest(BaseModel):
-    library_id: List[str] = Field(
+    library_ids: List[str] = Field(
         description="Array of valid Context7 library IDs, such as '/tiangolo/fastapi' or '/sqlalchemy/sqlalchemy'. "
         "Must correspond index-wise with 'tokens' and 'topics'.",
         examples=[{"library_ids": ["/tiangolo/fastapi", "/sqlalchemy/sqlalchemy"]}],
@@ -90,3 +92,21 @@ class GetMultipleLibraryDocsResponse(BaseModel):
     library_infos: List[str] = Field(
         description="Array of documentation strings, aligned positionally with the input arrays of library IDs, tokens, and topics."
     )
+
+
+class SearchResult(msgspec.Struct, rename="camel"):
+    """A single library entry returned by the Context7 search API."""
+
+    id: str | None = ""
+    title: str | None = ""
+    description: str | None = ""
+    total_snippets: int | None = None
+    trust_score: int | float | None = None
+    versions: List[str] | None = None
+
+
+class SearchResponse(msgspec.Struct):
+    """Context7 search API response, or an error marker for non-200 responses."""
+
+    results: List[SearchResult] = []
+    error: str | None = None
@@ -1,42 +1,75 @@
+import re
+
+from functools import lru_cache
+
 from pydantic import Field, SecretStr
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+_SECRET_KEY_RE = re.compile(r"secret|password", re.IGNORECASE)
+
+
 class Settings(BaseSettings):
-    model_config = SettingsConfigDict(env_file=(".env",), env_file_encoding="utf-8")
+    model_config = SettingsConfigDict(
+        env_file=(".env",),
+        env_file_encoding="utf-8",
+        frozen=True,
+        validate_assignment=False,
+    )
 
     app_host: str = Field(description="APP host")
     app_port: int = Field(description="APP port")
     mcp_path: str = Field(description="MCP path")
     api_path: str = Field(description="API path")
     log_level: str = Field(description="Log level")
-    cert_file: str = Field(description="Certificate file")
-    key_file: str = Field(description="Private key file")
+    cert_file: str | None = Field(default=None, description="Certificate file")
+    key_file: str | None = Field(default=None, description="Private key file")
     app_root_path: str = Field(description="FastAPI root path")
+    enable_docs: bool = Field(default=True, description="Serve OpenAPI schema and docs")
+    workers: int = Field(default=1, description="Number of uvicorn worker processes")
 
-    client_ip_encryption_key: str = Field(description="Client IP encryption key")
+    client_ip_encryption_key: SecretStr = Field(description="Client IP encryption key")
     context7_api_base_url: str = Field(description="Context 7 API base url")
     default_tokens: int = Field(description="Default tokens")
     minimum_tokens: int = Field(description="Minimum tokens")
     api_key: SecretStr = Field(description="API key")
+    http_timeout: float = Field(default=30.0, description="Upstream HTTP timeout in seconds")
+    http_max_connections: int = Field(default=200, description="Upstream HTTP connection pool size")
+    http_max_keepalive_connections: int = Field(default=100, description="Upstream HTTP keep-alive connections")
+    max_upstream_concurrency: int = Field(default=16, description="Maximum concurrent upstream requests per batch call")
+    cache_ttl_seconds: float = Field(default=300.0, description="Lifetime of cached upstream results in seconds")
+    cache_max_size: int = Field(default=1024, description="Maximum number of cached search results")
+    docs_cache_max_size: int = Field(default=64, description="Maximum number of cached documentation bodies")
+    warmup_libraries: list[str] = Field(default=[], description="Library names resolved at startup")
+    warmup_docs: bool = Field(default=False, description="Also fetch default docs for warmup libraries")
 
-    fastmcp_experimental_enable_new_openapi_parser: bool = Field(description="Enable new openapi parser in FastAPI-MCP")
+    fastmcp_experimental_enable_new_openapi_parser: bool = Field(default=False, description="Enable new openapi parser in FastAPI-MCP")
 
     def __str__(self):
-        secret_terms = ["secret", "password"]
+        lines = "".join(
+            f"  {key}: {'***' if key in _SENSITIVE_FIELDS else getattr(self, key)}\n"
+            for key in type(self).model_fields
+        )
+        return "\nLoaded config:\n" + lines
+
 
-        msg = "\nLoaded config:\n"
-        for key, value in self.model_dump().items():
-            for secret_term in secret_terms:
-                if secret_term.lower() in key.lower():
-                    value = "***"
-            msg += f"  {key}: {value}\n"
-        return msg
+_SENSITIVE_FIELDS = frozenset(
+    name
+    for name, field in Settings.model_fields.items()
+    if field.annotation is SecretStr or _SECRET_KEY_RE.search(name)
+)
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
+    """Return the process-wide Settings instance, building it on first call.
+
+    This is the only place Settings is constructed; use it (or the module-level
+    `settings` instance) rather than instantiating Settings directly, including
+    as a FastAPI dependency.
+    """
     return Settings()
 
 
-settings = Settings()
+settings = get_settings()
@@ -1,83 +1,185 @@
 # src/context7/main.py
-import uvicorn
-
-from fastapi import FastAPI
-from fastapi_mcp import FastApiMCP
+import os
+import ssl
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+import orjson
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware import Middleware
 from starlette.requests import Request
-from starlette.responses import JSONResponse
 
 from context7.exceptions import AppException
 from context7.settings import settings
 from context7.logger import pretty_logging, logger
-from context7.api import router as mcp_router
+from context7.api import router as mcp_router, lifespan as api_lifespan
 
+if TYPE_CHECKING:
+    from fastapi_mcp import FastApiMCP
 
-fastapi_app = FastAPI(
-    title="Context7",
-    description="An assistant that helps answering software development related questions with context7.",
-    version="0.1.0",
-)
 
-fastapi_app.include_router(mcp_router, prefix=settings.api_path)
-fastapi_app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-mcp_server = FastApiMCP(
-    fastapi_app,
-    include_operations=[
+_MCP_OPERATIONS = frozenset(
+    {
         "get_default_prompt",
         "resolve_library_id",
         "get_library_docs",
         "resolve_multiple_library_ids",
         "get_multiple_library_docs",
+    }
+)
+
+
+def _setup_mcp(app: FastAPI) -> "FastApiMCP":
+    from fastapi_mcp import FastApiMCP
+
+    if settings.fastmcp_experimental_enable_new_openapi_parser:
+        logger.warning(
+            "FASTMCP_EXPERIMENTAL_ENABLE_NEW_OPENAPI_PARSER has no effect: "
+            "fastapi-mcp always builds MCP tools from the FastAPI OpenAPI schema."
+        )
+
+    mcp_server = FastApiMCP(
+        app,
+        include_operations=_MCP_OPERATIONS,
+    )
+    mcp_server.mount_http()
+    return mcp_server
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if getattr(app.state, "mcp_server", None) is None:
+        app.state.mcp_server = _setup_mcp(app)
+    pretty_logging(app, settings, app.state.mcp_server)
+    async with api_lifespan(app):
+        yield
+
+
+fastapi_app = FastAPI(
+    title="Context7",
+    description="An assistant that helps answering software development related questions with context7.",
+    version="0.1.0",
+    openapi_url="/openapi.json" if settings.enable_docs else None,
+    docs_url="/docs" if settings.enable_docs else None,
+    redoc_url="/redoc" if settings.enable_docs else None,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+    middleware=[
+        Middleware(
+            CORSMiddleware,
+            allow_origins=["*"],
+            allow_credentials=True,
+            allow_methods=("GET", "POST", "DELETE", "OPTIONS"),
+            allow_headers=(
+                "accept",
+                "authorization",
+                "content-type",
+                "x-api-key",
+                "last-event-id",
+                "mcp-protocol-version",
+                "mcp-session-id",
+            ),
+        )
     ],
 )
-mcp_server.mount_http()
+
+fastapi_app.include_router(mcp_router, prefix=settings.api_path)
+
+_INTERNAL_ERROR_BYTES = orjson.dumps({"detail": "Internal server error"})
 
 
 @fastapi_app.exception_handler(AppException)
 async def app_exception_handler(request: Request, exc: AppException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
-        content={"detail": exc.message, "exception": exc, "request": request},
+        content={"detail": exc.message, "type": exc.__class__.__name__},
     )
 
 
 @fastapi_app.exception_handler(Exception)
 async def unhandled_exception_handler(request: Request, exc: Exception):
-    return JSONResponse(
-        status_code=500,
-        content={"detail": f"Internal server error", "exception": exc, "request": request},
+    logger.opt(exception=exc).error(
+        "Unhandled exception on {} {}", request.method, request.url.path
+    )
+    return Response(
+        content=_INTERNAL_ERROR_BYTES, status_code=500, media_type="application/json"
     )
 
 
+def _build_ssl_context(certfile: str, keyfile: str) -> ssl.SSLContext:
+    for path in (certfile, keyfile):
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"TLS file not found: {path}")
+    ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    ctx.load_cert_chain(certfile, keyfile)
+    return ctx
+
+
 def main():
-    pretty_logging(fastapi_app, settings, mcp_server)
+    import uvicorn
 
-    if settings.cert_file is None or settings.key_file is None:
+    if not settings.cert_file or not settings.key_file:
         logger.info("Use no tls.")
-        ssl_certfile = None
-        ssl_keyfile = None
+        ssl_context = None
     else:
         logger.info("Using tls.")
-        ssl_certfile = settings.cert_file
-        ssl_keyfile = settings.key_file
-
-    uvicorn.run(
+        ssl_context = _build_ssl_context(settings.cert_file, settings.key_file)
+
+    try:
+        import uvloop  # noqa: F401
+
+        loop = "uvloop"
+    except ImportError:
+        logger.warning("uvloop not available, falling back to asyncio event loop.")
+        loop = "asyncio"
+
+    try:
+        import httptools  # noqa: F401
+
+        http = "httptools"
+    except ImportError:
+        logger.warning("httptools not available, falling back to h11 protocol.")
+        http = "h11"
+
+    if settings.workers > 1:
+        # Worker processes import the app themselves and an SSLContext cannot
+        # be handed across processes, so give uvicorn the certificate paths
+        # and let every worker build its own context.
+        uvicorn.run(
+            "main:fastapi_app",
+            host=settings.app_host,
+            port=settings.app_port,
+            root_path=settings.app_root_path,
+            log_config=None,
+            ssl_certfile=settings.cert_file if ssl_context else None,
+            ssl_keyfile=settings.key_file if ssl_context else None,
+            loop=loop,
+            http=http,
+            workers=settings.workers,
+        )
+        return
+
+    config = uvicorn.Config(
         fastapi_app,
         host=settings.app_host,
         port=settings.app_port,
         root_path=settings.app_root_path,
         log_config=None,
-        ssl_certfile=ssl_certfile,
-        ssl_keyfile=ssl_keyfile,
+        ssl_certfile=settings.cert_file if ssl_context else None,
+        ssl_keyfile=settings.key_file if ssl_context else None,
+        loop=loop,
+        http=http,
     )
+    # uvicorn.Config only accepts certificate paths; load it up front and
+    # swap in the prebuilt context so the server binds with it as-is. The
+    # paths stay on the config so a later load() rebuilds TLS rather than
+    # silently falling back to plain HTTP.
+    config.load()
+    if ssl_context is not None:
+        config.ssl = ssl_context
+    uvicorn.Server(config).run()
 
 
 if __name__ == "__main__":
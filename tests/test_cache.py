@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from context7 import cache
+from context7.cache import async_ttl_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache.time, "monotonic", fake)
+    return fake
+
+
+def make_cached(ttl=10.0, maxsize=8, cache_if=lambda result: True, delay=0.0):
+    calls = []
+
+    @async_ttl_cache(ttl=ttl, maxsize=maxsize, cache_if=cache_if)
+    async def lookup(key: str, suffix: str = "") -> str:
+        calls.append(key)
+        await asyncio.sleep(delay)
+        return key + suffix
+
+    return lookup, calls
+
+
+def test_concurrent_calls_are_coalesced():
+    lookup, calls = make_cached(delay=0.01)
+
+    async def run():
+        return await asyncio.gather(*(lookup("a") for _ in range(5)))
+
+    assert asyncio.run(run()) == ["a"] * 5
+    assert calls == ["a"]
+
+
+def test_keyword_and_default_arguments_share_an_entry():
+    lookup, calls = make_cached()
+
+    async def run():
+        await lookup("a")
+        await lookup(key="a")
+        await lookup("a", "")
+        await lookup("a", suffix="!")
+
+    asyncio.run(run())
+    assert calls == ["a", "a"]
+
+
+def test_entries_expire_after_ttl(clock):
+    lookup, calls = make_cached(ttl=10.0)
+
+    async def run():
+        await lookup("a")
+        clock.now = 9.0
+        await lookup("a")
+        clock.now = 10.0
+        await lookup("a")
+
+    asyncio.run(run())
+    assert calls == ["a", "a"]
+
+
+def test_least_recently_used_entry_is_evicted():
+    lookup, calls = make_cached(maxsize=2)
+
+    async def run():
+        await lookup("a")
+        await lookup("b")
+        await lookup("a")
+        await lookup("c")  # evicts "b"
+        await lookup("a")
+        await lookup("b")
+
+    asyncio.run(run())
+    assert calls == ["a", "b", "c", "b"]
+
+
+def test_failures_and_rejected_results_are_not_cached():
+    lookup, calls = make_cached(cache_if=lambda result: result != "skip")
+    attempts = []
+
+    @async_ttl_cache(ttl=10.0, maxsize=8)
+    async def flaky() -> str:
+        attempts.append(None)
+        if len(attempts) == 1:
+            raise RuntimeError("upstream down")
+        return "ok"
+
+    async def run():
+        await lookup("skip")
+        await lookup("skip")
+        with pytest.raises(RuntimeError):
+            await flaky()
+        assert await flaky() == "ok"
+        assert await flaky() == "ok"
+
+    asyncio.run(run())
+    assert calls == ["skip", "skip"]
+    assert len(attempts) == 2
+
+
+def test_cache_clear_drops_entries():
+    lookup, calls = make_cached()
+
+    async def run():
+        await lookup("a")
+        lookup.cache_clear()
+        await lookup("a")
+
+    asyncio.run(run())
+    assert calls == ["a", "a"]